@@ -0,0 +1,110 @@
+"""
+Compare the sampling modes of Wordl on the find_best_openers workload.
+
+The pool is made of the best openers in data/best_openers.txt (the close
+competitors that are hard to rank). Each opener is evaluated once against
+every possible solution with Wordl, which gives the exact scores. The UCB
+search of find_best_openers is then replayed on the pool for every sampling
+mode, reading the evaluations from that table (same values Wordl would
+return), and the top-k found is compared with the exact top-k.
+'independent' gives every opener its own permutation (no common random numbers),
+'cycle' always uses the stored order, so all of its seeds give the same result.
+Finally, the search is run with early stopping on the paired statistics.
+"""
+import numpy as np
+from src.wordl import Wordl
+from src.load_data import load_data, BASE_DIR
+from src.search import Search
+
+PATH_OPENERS = BASE_DIR / 'data' / 'best_openers.txt'
+MODES = ('independent', 'cycle', 'crn', 'stratified')
+
+
+def evaluate_pool(wordl, pool):
+    """Score of each guess in the pool against each solution, in stored order: shape (len(pool), n_wordles)"""
+    guess_index = {word: i for i, word in enumerate(wordl.get_guesses())}
+    n = len(wordl.wordles)
+    wordl.reset_call_counts()
+    scores = np.zeros((len(pool), n))
+    for a, word in enumerate(pool):
+        evaluate = wordl[guess_index[word]]
+        scores[a] = [evaluate() for _ in range(n)]
+        print(f'\rexact scores {a + 1} / {len(pool)}', end='')
+    print()
+    return scores
+
+
+def get_orders(wordl, mode, seed, n_elements):
+    """Sample order of each element of the pool"""
+    if mode == 'independent':
+        rng = np.random.default_rng(seed)
+        return [rng.permutation(len(wordl.wordles)) for _ in range(n_elements)]
+    wordl.set_sampling(mode, seed)
+    return [wordl.get_sample_order()] * n_elements
+
+
+def replay_search(scores, orders, budgets, top_k, c=2., alpha=None, n_leaders=5):
+    """
+    Run the search of find_best_openers on the pool.
+    Return the top-k found after each budget (number of evaluations),
+    and the number of evaluations used.
+    """
+    n_elements, n = scores.shape
+    counts = np.zeros(n_elements, dtype=int)
+
+    def element(a):
+        def wrap():
+            value = scores[a, orders[a][counts[a] % n]]
+            counts[a] += 1
+            return value
+        return wrap
+
+    search = Search([element(a) for a in range(n_elements)],
+                    prior_values=np.full(n_elements, 0.5), prior_visits=np.ones(n_elements, dtype=int),
+                    c=c, keep_samples=True, population_size=n)
+    top = {}
+    budgets = sorted(budgets)
+    for budget in budgets:
+        for _ in search.run(budget - counts.sum(), alpha=alpha, n_leaders=n_leaders):
+            pass
+        top[budget] = set(np.argsort(search.get_visits_plus_score())[::-1][:top_k])
+        if counts.sum() < budget:  # stopped early
+            break
+    return top, counts.sum()
+
+
+def benchmark_sampling(n_pool=40, top_k=5, budgets=(250, 500, 1000, 2000, 4000, 8000),
+                       n_seeds=20, alpha=0.05, n_leaders=2, max_evaluations=30_000):
+    allowed_wordles, allowed_guesses, alphabet = load_data()
+    wordl = Wordl(allowed_wordles, allowed_guesses, alphabet=alphabet)
+    with open(PATH_OPENERS) as f:
+        pool = [line.strip().lower() for line in f][:n_pool]
+    scores = evaluate_pool(wordl, pool)
+    exact_top = set(np.argsort(scores.mean(axis=1))[::-1][:top_k])
+
+    # Fraction of the exact top-k found, averaged over the seeds
+    print(f'\ntop-{top_k} agreement with the exact ranking of {n_pool} openers ({n_seeds} seeds)')
+    print(f'{"evaluations":>12} ' + ' '.join(f'{mode:>12}' for mode in MODES))
+    agreement = {mode: np.zeros(len(budgets)) for mode in MODES}
+    for mode in MODES:
+        for seed in range(n_seeds):
+            top, _ = replay_search(scores, get_orders(wordl, mode, seed, n_pool), budgets, top_k)
+            agreement[mode] += [len(top[budget] & exact_top) / top_k / n_seeds for budget in budgets]
+    for i, budget in enumerate(budgets):
+        print(f'{budget:>12} ' + ' '.join(f'{agreement[mode][i]:>12.3f}' for mode in MODES))
+
+    # Early stopping on the paired statistics
+    print(f'\nstopping when the top {n_leaders} are separated, alpha={alpha} (max {max_evaluations:,} evaluations)')
+    best = np.argmax(scores.mean(axis=1))
+    for mode in MODES:
+        used, correct = [], 0
+        for seed in range(n_seeds):
+            top, n_used = replay_search(scores, get_orders(wordl, mode, seed, n_pool), [max_evaluations], 1,
+                                        alpha=alpha, n_leaders=n_leaders)
+            used.append(n_used)
+            correct += best in list(top.values())[-1]
+        print(f'{mode:>12}: {np.mean(used):8.0f} evaluations on average, best opener found {correct}/{n_seeds}')
+
+
+if __name__ == "__main__":
+    benchmark_sampling()
@@ -5,30 +5,37 @@ from src.search import Search
 import numpy as np
 
 
-def find_best_openers(n_iter, top_k=1000, output_file="../data/best_openers.txt"):
+def find_best_openers(n_iter, top_k=1000, output_file="../data/best_openers.txt",
+                      sampling="cycle", seed=0, n_leaders=5, alpha=None):
     """
     Search for the best Wordle openers, and save them in a file.
     Param:
         n_iter: number of total visits
         top_k: save this many words in the file
         output_file: output file path
+        sampling: order in which the solutions are sampled (see Wordl)
+        seed: seed of the sampling order
+        n_leaders: print the paired differences between this many leaders
+        alpha: stop early once the best opener beats the other leaders, with this
+            probability of a wrong stop (None = never, see Search.run)
     """
     # No constraints: all words are possible solutions
     # (green, yellow, black are already reset)
-    allowed_wordles, allowed_guesses = load_data()
-    wordl = Wordl(allowed_wordles, allowed_guesses)
+    allowed_wordles, allowed_guesses, alphabet = load_data()
+    wordl = Wordl(allowed_wordles, allowed_guesses, sampling=sampling, seed=seed, alphabet=alphabet)
 
     # Initialize with one dummy visit to avoid division by zero
     n_guesses = len(wordl.guesses)
     prior_scores = np.full(n_guesses, 0.5)
     prior_visits = np.full(n_guesses, 1)
-    search = Search(wordl, prior_values=prior_scores, prior_visits=prior_visits, c=2.0)
+    search = Search(wordl, prior_values=prior_scores, prior_visits=prior_visits, c=2.0,
+                    keep_samples=True, population_size=len(wordl.wordles))
 
     print(f"Running search for best openers ({n_iter:,} iterations)...")
-    for i, _ in enumerate(search.run(n_iter)):
+    for i, _ in enumerate(search.run(n_iter, alpha=alpha, n_leaders=n_leaders)):
         if (i + 1) % max(1, n_iter // 100) == 0:
             print(f"\r{i + 1:,} / {n_iter:,} iterations", end="")
-    print("\nSearch complete.")
+    print(f"\nSearch complete ({search.get_total_visits() - n_guesses:,} evaluations).")
 
     # Compute average scores
     epsilon = 1e-8
@@ -40,6 +47,12 @@ def find_best_openers(n_iter, top_k=1000, output_file="../data/best_openers.txt"
     top_scores = [avg_scores[i] for i in top_indices]
     top_visits = [search.visits[i] for i in top_indices]
 
+    # Paired differences between the best opener and the other leaders (same ranking as the file)
+    for index in top_indices[1:n_leaders]:
+        dct = search.get_paired_difference(top_indices[0], index)
+        print(f"{top_words[0].upper()} - {wordl.guesses[index].upper()}: "
+              f"{dct['mean']:+.4f} ± {dct['std_err']:.4f} (n={dct['n']}, z={dct['z']:.2f})")
+
     # Ensure output dir exists
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
@@ -11,8 +11,8 @@ from src.load_data import load_data
 class WordleHelper:
 
     def __init__(self):
-        self.allowed_wordles, self.allowed_guesses = load_data()
-        self.wordl = Wordl(self.allowed_wordles, self.allowed_guesses)
+        self.allowed_wordles, self.allowed_guesses, self.alphabet = load_data()
+        self.wordl = Wordl(self.allowed_wordles, self.allowed_guesses, alphabet=self.alphabet)
 
     def run_helper(self, green, yellow, black, n_iter, n_display=20, c=2.):
         """
@@ -1,4 +1,8 @@
+import gzip
+import unicodedata
 from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
 
 
 # Define paths relative to the project root
@@ -6,13 +10,145 @@ BASE_DIR = Path(__file__).resolve().parent.parent  # Gets Wordl/ directory
 PATHS_WORDLES = BASE_DIR / 'data' / 'shuffled_real_wordles.txt'
 PATHS_GUESSES = BASE_DIR / 'data' / 'official_allowed_guesses.txt'
 
-def load_data():
-    with open(PATHS_WORDLES, encoding='utf-8') as f:
-        allowed_wordles = f.read().split('\n')
-        allowed_wordles = allowed_wordles[1:-1]
+COMMENT_PREFIX = '#'
+MAX_LETTERS = 256  # letters that fit in one uint8 code
+_GZIP_MAGIC = b'\x1f\x8b'
 
-    with open(PATHS_GUESSES, encoding='utf-8') as f:
-        allowed_guesses = f.read().split('\n')
-        allowed_guesses = allowed_guesses[1:-1]
 
-    return allowed_wordles, allowed_guesses
+class Alphabet:
+    """
+    Table between letters and uint8 codes, grown while the words are encoded.
+    Any script with at most 256 letters fits in one byte per letter.
+    """
+    def __init__(self, letters: Iterable[str] = ()):
+        self.letters = []
+        self.codes = {}
+        for letter in letters:
+            self.add_letter(letter)
+
+    def __len__(self):
+        return len(self.letters)
+
+    def add_letter(self, letter: str) -> int:
+        if letter not in self.codes:
+            if len(self.letters) >= MAX_LETTERS:
+                raise ValueError(f'Alphabet is full ({MAX_LETTERS} letters), cannot add {letter!r}')
+            self.codes[letter] = len(self.letters)
+            self.letters.append(letter)
+        return self.codes[letter]
+
+    def get_code(self, letter: str) -> int:
+        """uint8 code of the letter (-1 if the letter is not in the alphabet, so it matches no word)"""
+        return self.codes.get(letter, -1)
+
+    def encode(self, word: str) -> Optional[bytes]:
+        """Encode a word, adding its new letters (None if they don't fit in the alphabet)."""
+        new_letters = set(word).difference(self.codes)
+        if len(self.letters) + len(new_letters) > MAX_LETTERS:
+            return None
+        return bytes([self.add_letter(letter) for letter in word])
+
+    def decode(self, array: np.ndarray) -> np.ndarray:
+        """Convert a (N, word_length) uint8 array back into an array of strings."""
+        table = np.array(self.letters + [''] * (MAX_LETTERS - len(self.letters)), dtype='U1')
+        return np.ascontiguousarray(table[array]).view(f'U{array.shape[1]}').ravel()
+
+
+def _open_text(path, encoding='utf-8'):
+    """Open a (possibly gzip-compressed) text file for reading."""
+    with open(path, 'rb') as f:
+        is_gzip = f.read(2) == _GZIP_MAGIC
+    if is_gzip:
+        return gzip.open(path, 'rt', encoding=encoding)
+    return open(path, encoding=encoding)
+
+
+def iter_words(path, encoding='utf-8') -> Iterable[str]:
+    """
+    Stream the words of a dictionary file, one per line.
+    Blank lines and lines starting with '#' are skipped.
+    """
+    with _open_text(path, encoding=encoding) as f:
+        for line in f:
+            word = line.strip()
+            if word and not word.startswith(COMMENT_PREFIX):
+                yield word
+
+
+def _is_word(word: str) -> bool:
+    """Only letters and combining marks (e.g. accents, Devanagari vowel signs)"""
+    return all(unicodedata.category(c)[0] in 'LM' for c in word)
+
+
+def encode_words(words: Iterable[str], alphabet: Alphabet, word_length: Optional[int] = None,
+                 skipped: Optional[Dict[str, int]] = None) -> np.ndarray:
+    """
+    Normalize (NFC, lower case), validate, deduplicate and encode words into
+    a (N, word_length) uint8 array.
+    The words are consumed in a single pass and only the encoded bytes are kept.
+    Invalid words are skipped: wrong length, characters that are not letters or
+    combining marks (e.g. apostrophes and hyphens), or letters that don't fit in the alphabet.
+
+    :param words: iterable of words
+    :param alphabet: letter table, extended with the new letters
+    :param word_length: keep only the words of this length (None = length of the first valid word)
+    :param skipped: if given, count the skipped words by reason ('length', 'letters', 'alphabet')
+    :return: encoded words, in order of first appearance
+        (empty only if word_length is given, otherwise no words raise a ValueError)
+    """
+    def skip(reason):
+        if skipped is not None:
+            skipped[reason] = skipped.get(reason, 0) + 1
+
+    inferred = word_length is None
+    buffer = bytearray()
+    for word in words:
+        word = unicodedata.normalize('NFC', word).lower()
+        if not _is_word(word):
+            skip('letters')
+            continue
+        if word_length is None:
+            word_length = len(word)
+        if len(word) != word_length:
+            skip('length')
+            continue
+        encoded = alphabet.encode(word)
+        if encoded is None:
+            skip('alphabet')
+            continue
+        buffer += encoded
+
+    if inferred and not buffer:
+        raise ValueError('No words found!')
+    array = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, word_length)
+    return unique_words(array)
+
+
+def unique_words(array: np.ndarray) -> np.ndarray:
+    """Remove duplicate rows of an encoded array, keeping the first occurrence."""
+    array = np.ascontiguousarray(array, dtype=np.uint8)
+    rows = array.view(f'V{array.shape[1]}').ravel()
+    _, indices = np.unique(rows, return_index=True)
+    return array[np.sort(indices)]
+
+
+def load_words(path, alphabet: Alphabet, word_length: Optional[int] = None, encoding='utf-8',
+               skipped: Optional[Dict[str, int]] = None) -> np.ndarray:
+    """Load a (possibly gzip-compressed) dictionary file into an encoded uint8 array."""
+    return encode_words(iter_words(path, encoding=encoding), alphabet,
+                        word_length=word_length, skipped=skipped)
+
+
+def load_data(path_wordles=PATHS_WORDLES, path_guesses=PATHS_GUESSES,
+              word_length: Optional[int] = None, encoding='utf-8') -> Tuple[np.ndarray, np.ndarray, Alphabet]:
+    """
+    Load the possible solutions and the allowed guesses as uint8 arrays
+    encoded with a shared alphabet.
+    If word_length is None, it is inferred from the first solution.
+    """
+    alphabet = Alphabet()
+    allowed_wordles = load_words(path_wordles, alphabet, word_length=word_length, encoding=encoding)
+    if len(allowed_wordles) == 0:
+        raise ValueError('No words found!')
+    allowed_guesses = load_words(path_guesses, alphabet, word_length=allowed_wordles.shape[1], encoding=encoding)
+    return allowed_wordles, allowed_guesses, alphabet
@@ -1,18 +1,25 @@
 import numpy as np
+from statistics import NormalDist
 
 
 class Search:
 
-    def __init__(self, elements, prior_values=None, prior_visits=None, c=2., max_visits_per_element=None):
+    def __init__(self, elements, prior_values=None, prior_visits=None, c=2., max_visits_per_element=None,
+                 keep_samples=False, population_size=None):
         """
         Find the index if the random variable with the highest
         average value in the smallest number of steps.
-        Doesn't exploit correlation between the elements.
+        The allocation of the visits doesn't exploit correlation between the elements,
+        but with keep_samples=True the paired statistics (and the early stop) do.
 
         :param elements: elements[i]() should return evaluation of the i-th element
         :param prior_values: prior average score for each element
         :param prior_visits: prior number of visits for each element
         :param max_visits_per_element: maximum number of visits allowed per element (None = unlimited)
+        :param keep_samples: store every sample, needed for the paired statistics between elements
+            (meaningful when the k-th sample of every element shares the same random numbers)
+        :param population_size: number of distinct samples of each element, when they are drawn
+            without replacement (None = infinite); the paired statistics become exact after that many
         """
         self.elements = elements
         self.n_elements = len(elements)
@@ -22,6 +29,8 @@ class Search:
         self.visits = np.zeros(self.n_elements, dtype=int)  # count number of visits
         self.c = c  # Hyper-parameter
         self.max_visits_per_element = max_visits_per_element  # todo remove?
+        self.samples = [[] for _ in range(self.n_elements)] if keep_samples else None
+        self.population_size = population_size
 
         self.total_visits = 0
         self.priorities = None  # Which element to visit
@@ -140,6 +149,8 @@ class Search:
         self.values[index] += new_value
         self.visits[index] += 1
         self.total_visits += 1
+        if self.samples is not None:
+            self.samples[index].append(new_value)
 
         # Set priorities to be recomputed
         self.priorities = None
@@ -177,17 +188,83 @@ class Search:
 
             yield self.visit_and_get_info(new_index)
 
-    def run(self, n_iter):
+    def get_stop_threshold(self, alpha, n_checks) -> float:
+        """
+        Paired z needed to stop early, with probability at most alpha of a wrong stop
+        (an element declared better than one that isn't worse). Bonferroni correction
+        over the n_checks looks and every ordered pair of elements, so it stays valid
+        even if the leaders change between looks (normal approximation of each z).
+        """
+        n_tests = n_checks * self.n_elements * (self.n_elements - 1)
+        return NormalDist().inv_cdf(1 - alpha / max(n_tests, 1))
+
+    def run(self, n_iter, alpha=None, n_leaders=5, min_pairs=30, check_period=100):
         """Run search.
 
         Iterating over this method yields a dictionary with the relevant info.
+
+        :param alpha: if given, stop early once the leaders are separated (see leaders_are_separated),
+            checked every check_period visits, with probability at most alpha of a wrong stop
+            (see get_stop_threshold, requires keep_samples=True)
         """
+        z_stop = None
+        if alpha is not None:
+            if self.samples is None:
+                raise ValueError("Set 'keep_samples=True' to stop on the paired statistics.")
+            if n_leaders < 2:
+                raise ValueError("'n_leaders' must be at least 2 to stop on the paired statistics.")
+            z_stop = self.get_stop_threshold(alpha, n_checks=n_iter // check_period)
         n_stop = self.get_total_visits() + n_iter
 
         # Visit the highest priority nodes
-        yield from self._visit_high_priority_elements(n_stop)
+        for i, info in enumerate(self._visit_high_priority_elements(n_stop)):
+            yield info
+            if (z_stop is not None and (i + 1) % check_period == 0 and
+                    self.leaders_are_separated(z_stop, n_leaders, min_pairs)):
+                break
 
     def get_visits_plus_score(self, k=1.):
         """
         Heuristic: number of visits + a score in [0,1] to remove doubles. """
         return self.get_visits() + self.get_scores() * k
+
+    def get_paired_difference(self, i, j) -> dict:
+        """
+        Statistics of (element i - element j) over the samples they have in common.
+        The k-th sample of i is paired with the k-th sample of j, so the elements
+        must start sampling from the same offset (e.g. Wordl.reset_call_counts).
+        """
+        if self.samples is None:
+            raise ValueError("Set 'keep_samples=True' to compute paired statistics.")
+        n = min(len(self.samples[i]), len(self.samples[j]))
+        if self.population_size is not None:
+            n = min(n, self.population_size)  # later samples are repeated
+        diff = np.array(self.samples[i][:n]) - np.array(self.samples[j][:n])
+        mean = diff.mean() if n > 0 else 0.
+        std_err = diff.std(ddof=1) / np.sqrt(n) if n > 1 else np.inf
+        if self.population_size is not None and n > 1:
+            std_err *= np.sqrt(1 - n / self.population_size)  # finite population correction
+        if std_err > 0:
+            z = mean / std_err
+        else:
+            z = np.sign(mean) * np.inf if mean else 0.
+        return {'n': n, 'mean': mean, 'std_err': std_err, 'z': z}
+
+    def get_leader_differences(self, n_leaders=5) -> list:
+        """
+        Paired statistics of the best element against each of the following leaders
+        (ranked by average value). Small z values mean the ranking is not settled yet.
+        """
+        leaders = np.argsort(self.get_scores())[::-1][:n_leaders]
+        best = leaders[0]
+        return [{'index': index, **self.get_paired_difference(best, index)} for index in leaders[1:]]
+
+    def leaders_are_separated(self, z_stop, n_leaders=5, min_pairs=10) -> bool:
+        """
+        True if the best element beats each of the other n_leaders - 1 leaders
+        with a paired z of at least z_stop, over at least min_pairs paired samples.
+        """
+        if n_leaders < 2:
+            raise ValueError("'n_leaders' must be at least 2 to separate the leaders.")
+        return all(dct['n'] >= min_pairs and dct['z'] >= z_stop
+                   for dct in self.get_leader_differences(n_leaders))
@@ -1,7 +1,8 @@
 import numpy as np
-from copy import deepcopy
-from typing import List, Dict, Optional
+from copy import copy
+from typing import List, Optional, Union
 from src.search import Search
+from src.load_data import Alphabet, encode_words, unique_words
 
 
 # ------------------------------------------------------------------
@@ -9,38 +10,83 @@ from src.search import Search
 # ------------------------------------------------------------------
 ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
 N_LETTER = len(ALPHABET)  # 26
-WORD_LEN = 5
+SAMPLING_MODES = ('cycle', 'crn', 'stratified')
 
+Words = Union[List[str], np.ndarray]  # list of strings, or (N, word_length) uint8 array
 
-# ------------------------------------------------------------------
-# Global immutable data – uint8 bytes from the start
-# ------------------------------------------------------------------
-_WORDLES_ARRAY: Optional[np.ndarray] = None   # (N, 5) uint8
-_GUESSES_ARRAY: Optional[np.ndarray] = None   # (M, 5) uint8
-_GUESS_TO_IDX: Optional[Dict[str, int]] = None
 
+def _is_encoded(words: Words) -> bool:
+    return isinstance(words, np.ndarray) and words.dtype == np.uint8
 
-def _init_globals(allowed_wordles: List[str], allowed_guesses: List[str]) -> None:
-    global _WORDLES_ARRAY, _GUESSES_ARRAY, _WORD_LENGTH
-    if _WORDLES_ARRAY is not None:
-        return
 
-    _WORDLES_ARRAY = np.array([np.array(list(s)) for s in allowed_wordles])
-    _GUESSES_ARRAY = np.array(list(set(allowed_wordles + allowed_guesses)))
-    _WORD_LENGTH = 5
+def _encode(words: Words, alphabet: Alphabet, word_length: Optional[int] = None) -> np.ndarray:
+    """Encode words into a uint8 array (arrays that are already encoded are kept as they are)."""
+    if _is_encoded(words):
+        return words
+    skipped = {}
+    array = encode_words(words, alphabet, word_length=word_length, skipped=skipped)
+    if skipped.get('length'):
+        raise ValueError(f"{skipped['length']} words don't have length {array.shape[1]}")
+    return array
 
 
-class Wordl:
+def stratified_permutation(strata: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Random permutation where every prefix contains each stratum
+    in (about) the same proportion as the whole set.
+    """
+    n = len(strata)
+    order = rng.permutation(n)
+    _, inverse, counts = np.unique(strata[order], return_inverse=True, return_counts=True)
+
+    # rank of each element inside its own stratum
+    by_stratum = np.argsort(inverse, kind='stable')
+    ranks = np.empty(n)
+    ranks[by_stratum] = np.arange(n) - np.repeat(np.cumsum(counts) - counts, counts)
 
-    @staticmethod
-    def get_guesses():
-        return _GUESSES_ARRAY
+    keys = (ranks + rng.random(n)) / counts[inverse]
+    return order[np.argsort(keys, kind='stable')]
 
-    def __init__(self, allowed_wordles: List[str], allowed_guesses: List[str]):
 
-        _init_globals(allowed_wordles, allowed_guesses)
+class Wordl:
+
+    def get_guesses(self):
+        return self.guesses
 
-        self.wordles = deepcopy(_WORDLES_ARRAY)
+    def __init__(self, allowed_wordles: Words, allowed_guesses: Words, word_length: Optional[int] = None,
+                 sampling: str = 'cycle', seed: Optional[int] = None, alphabet: Optional[Alphabet] = None):
+        """
+        :param allowed_wordles: possible solutions (strings or encoded uint8 array)
+        :param allowed_guesses: extra allowed guesses (strings or encoded uint8 array)
+        :param word_length: length of the words (None = infer from allowed_wordles)
+        :param sampling: order in which each guess is tested against the possible solutions
+            'cycle' = stored order,
+            'crn' = seeded permutation shared by all the guesses (common random numbers),
+            'stratified' = like 'crn', but every prefix is stratified by first letter
+        :param seed: seed of the permutation
+        :param alphabet: letter table of the encoded arrays (required if they are already encoded)
+        """
+        self.sampling = None
+        self.seed = None
+        self.sample_order = None  # order in which the solutions are sampled
+        self.set_sampling(sampling, seed)
+
+        if alphabet is None:
+            if _is_encoded(allowed_wordles) or _is_encoded(allowed_guesses):
+                raise ValueError("Pass the 'alphabet' used to encode the words.")
+            alphabet = Alphabet()
+        self.alphabet = alphabet
+
+        self.wordles = _encode(allowed_wordles, self.alphabet, word_length)  # (N, word_length) uint8
+        self.word_length = self.wordles.shape[1]
+        if word_length is not None and word_length != self.word_length:
+            raise ValueError(f'Expected words of length {word_length}, got {self.word_length}')
+        if len(self.wordles) == 0:
+            raise ValueError('Zero possible solutions!')
+        guesses = _encode(allowed_guesses, self.alphabet, self.word_length)
+        if guesses.shape[1] != self.word_length:
+            raise ValueError(f'Guesses have length {guesses.shape[1]}, wordles have length {self.word_length}')
+        self.guesses = self.alphabet.decode(unique_words(np.concatenate([self.wordles, guesses])))
         self._max_score = np.log2(len(self.wordles))
 
         self.green = None   # list of letters in the right place
@@ -54,12 +100,24 @@ class Wordl:
         # Track calls to __getitem__ for each guess index
         self.call_counts = np.zeros(len(self.get_guesses()), dtype=int)
 
+    def set_sampling(self, sampling: str, seed: Optional[int] = None):
+        """Change the order in which the solutions are sampled (see __init__)."""
+        if sampling not in SAMPLING_MODES:
+            raise ValueError(f'Unknown sampling {sampling!r}, choose from {SAMPLING_MODES}')
+        self.sampling = sampling
+        self.seed = seed
+        self.sample_order = None
+
+    def reset_call_counts(self):
+        """Start sampling every guess from the first solution of the sample order again."""
+        self.call_counts[:] = 0
+
     def __len__(self):
         return len(self.get_guesses())
 
     def reset_colors(self):
-        self.green = [''] * _WORD_LENGTH
-        self.yellow = [set() for _ in range(_WORD_LENGTH)]
+        self.green = [''] * self.word_length
+        self.yellow = [set() for _ in range(self.word_length)]
         self.black = set()
 
     def set_new_colors(self, green: List[str], yellow: List[set], black: set):
@@ -70,9 +128,9 @@ class Wordl:
         :return:
         """
         assert type(green) is list
-        assert len(green) == _WORD_LENGTH
+        assert len(green) == self.word_length
         assert type(yellow) is list
-        assert len(yellow) == _WORD_LENGTH
+        assert len(yellow) == self.word_length
         assert type(black) is set
         self.green = green
         self.yellow = yellow
@@ -83,10 +141,10 @@ class Wordl:
         Remove words that don't fit the 'green' condition
         (right letter in the right spot)
         """
-        for i in range(_WORD_LENGTH):
+        for i in range(self.word_length):
             letter = self.green[i]
             if len(letter):
-                indices = self.wordles[:, i] == letter
+                indices = self.wordles[:, i] == self.alphabet.get_code(letter)
                 self.wordles = self.wordles[indices]
 
     def update_black(self):
@@ -95,7 +153,7 @@ class Wordl:
         (the given letters are not present)
         """
         for c in self.black:
-            v = np.isin(self.wordles, c, assume_unique=True)
+            v = self.wordles == self.alphabet.get_code(c)
             v = np.sum(v, axis=1) == False
             self.wordles = self.wordles[v]
 
@@ -104,9 +162,9 @@ class Wordl:
         Remove words that don't fit the 'yellow' condition
         (right letter, but in the wrong spot)
         """
-        for i in range(_WORD_LENGTH):
+        for i in range(self.word_length):
             for c in self.yellow[i]:
-                v = np.isin(self.wordles, c, assume_unique=True)
+                v = self.wordles == self.alphabet.get_code(c)
                 v[:, i] *= False
                 v = (np.sum(v, axis=1) > 0) == True
                 self.wordles = self.wordles[v]
@@ -115,16 +173,34 @@ class Wordl:
         """
         Remove words where a yellow letter appears in the position where it was marked yellow.
         """
-        for i in range(_WORD_LENGTH):
+        for i in range(self.word_length):
             if self.yellow[i]:  # Check if the set is non-empty
-                v = ~np.isin(self.wordles[:, i], list(self.yellow[i]))
+                v = ~np.isin(self.wordles[:, i], [self.alphabet.get_code(c) for c in self.yellow[i]])
                 self.wordles = self.wordles[v]
 
     def set_possible_solutions(self):
         """Build the list of words"""
-        self.possible_solutions = np.array([''.join(v) for v in self.wordles])
+        self.possible_solutions = self.alphabet.decode(self.wordles)
         if len(self.possible_solutions) == 0:
             raise ValueError('Zero possible solutions!')
+        self.sample_order = None
+
+    def get_sample_order(self) -> np.ndarray:
+        """
+        Indices of the possible solutions, in the order they are sampled.
+        The k-th sample of every guess uses the same solution, and each
+        guess sees every solution exactly once in len(wordles) samples.
+        """
+        if self.sample_order is None:
+            n = len(self.wordles)
+            rng = np.random.default_rng(self.seed)
+            if self.sampling == 'crn':
+                self.sample_order = rng.permutation(n)
+            elif self.sampling == 'stratified':
+                self.sample_order = stratified_permutation(self.wordles[:, 0], rng)
+            else:
+                self.sample_order = np.arange(n)
+        return self.sample_order
 
     def update_wordles(self):
         """
@@ -138,8 +214,8 @@ class Wordl:
         self.set_possible_solutions()
 
     def guess(self, word, solution):
-        assert len(word) == _WORD_LENGTH
-        assert len(solution) == _WORD_LENGTH
+        assert len(word) == self.word_length
+        assert len(solution) == self.word_length
         self.reset_colors()
         for i in range(len(word)):
             if solution[i] == word[i]:
@@ -170,11 +246,12 @@ class Wordl:
         def wrap():
             word_guess = self.get_guesses()[index]
 
-            solution_index = self.call_counts[index] % len(self.wordles)  # loop around just in case
+            sample_order = self.get_sample_order()
+            solution_index = sample_order[self.call_counts[index] % len(sample_order)]  # loop around just in case
             self.call_counts[index] += 1
 
-            solution = self.wordles[solution_index]
-            wordl = deepcopy(self)
+            solution = self.possible_solutions[solution_index]
+            wordl = copy(self)  # filtering never modifies arrays in place
             wordl.guess(word_guess, solution)
             wordl.update_wordles()
             return wordl.get_score()
@@ -188,6 +265,9 @@ class Wordl:
         Returns the word that was most explored during search.
         """
 
+        # Pair the samples of this search (k-th sample of each guess = same solution)
+        self.reset_call_counts()
+
         # Init search (add one visit with value 0 to every guess)
         n_guesses = len(self.get_guesses())
         prior_scores = np.full(n_guesses, 0.)
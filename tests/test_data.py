@@ -1,4 +1,6 @@
-from src.load_data import PATHS_WORDLES, PATHS_GUESSES
+import gzip
+import pytest
+from src.load_data import PATHS_WORDLES, PATHS_GUESSES, Alphabet, encode_words, load_data, load_words
 
 
 def test_1():
@@ -17,6 +19,53 @@ def test_2():
             print(w)
 
 
+def test_load_words(tmp_path):
+    path = tmp_path / 'words.txt.gz'
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write("# comment\nHaus\n\nbaum\nhaus\nmüll\nbaume\ndon't\nłódź\n")
+
+    alphabet = Alphabet()
+    skipped = {}
+    words = load_words(path, alphabet, word_length=4, skipped=skipped)
+    assert words.dtype == 'uint8'
+    assert list(alphabet.decode(words)) == ['haus', 'baum', 'müll', 'łódź']
+    assert skipped == {'length': 1, 'letters': 1}
+
+
+def test_encode_words_normalization():
+    alphabet = Alphabet()
+    nfd = 'cafe\u0301s'  # 'e' + combining acute accent
+    words = encode_words(['HAUS', 'Cafés', nfd, 'किताब'], alphabet, word_length=5)
+    assert list(alphabet.decode(words)) == ['cafés', 'किताब']
+    assert encode_words(['HAUS', 'haus'], alphabet).shape == (1, 4)
+
+
+def test_encode_words_errors():
+    assert encode_words(['crate', 'slate'], Alphabet(), word_length=6).shape == (0, 6)
+    with pytest.raises(ValueError):
+        encode_words([], Alphabet())
+    with pytest.raises(ValueError):
+        load_data(word_length=6)
+
+    alphabet = Alphabet(chr(0x4e00 + i) for i in range(256))
+    skipped = {}
+    with pytest.raises(ValueError):
+        encode_words(['łódka'], alphabet, skipped=skipped)
+    assert skipped == {'alphabet': 1}
+
+
+def test_load_data(tmp_path):
+    wordles, guesses, alphabet = load_data()
+    assert wordles.shape == (2315, 5)
+    assert guesses.shape == (10657, 5)
+    assert len(alphabet) == 26
+
+    path = tmp_path / 'words.txt'
+    path.write_text('żółw\nłoś\nźrebak\n', encoding='iso-8859-2')
+    wordles, guesses, alphabet = load_data(path, path, encoding='iso-8859-2')
+    assert list(alphabet.decode(wordles)) == ['żółw']
+
+
 if __name__ == '__main__':
     test_1()
     test_2()
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 import matplotlib.pyplot as plt
 from src.search import Search
 
@@ -55,5 +56,76 @@ def test_search(n_elements=15, n_iter=300, noise=0.4, c=2.):
     plt.show()
 
 
+def test_paired_difference(n_elements=4, n_iter=200):
+    rng = np.random.default_rng(0)
+    noise = rng.normal(size=n_iter)  # common random numbers, shared by all the elements
+    counts = np.zeros(n_elements, dtype=int)
+
+    def element(index):
+        def wrap():
+            value = index * 0.01 + noise[counts[index]]
+            counts[index] += 1
+            return value
+        return wrap
+
+    search = Search([element(i) for i in range(n_elements)], keep_samples=True)
+    for _ in search.run(n_iter=n_iter):
+        pass
+
+    differences = search.get_leader_differences(n_leaders=n_elements)
+    assert len(differences) == n_elements - 1
+    for dct in differences:
+        best = search.get_best_index()
+        assert np.isclose(dct['mean'], (best - dct['index']) * 0.01)
+        assert np.isclose(dct['std_err'], 0.)
+
+
+def correlated_elements(means, rng, population_size=None, noise=1., independent_noise=0.5):
+    """elements sharing the k-th common noise, plus some independent noise"""
+    common = rng.normal(size=population_size or 100_000) * noise
+    counts = np.zeros(len(means), dtype=int)
+
+    def element(index):
+        def wrap():
+            value = means[index] + common[counts[index] % len(common)] + rng.normal() * independent_noise
+            counts[index] += 1
+            return value
+        return wrap
+
+    return [element(i) for i in range(len(means))]
+
+
+def test_stop_on_paired_statistics(n_elements=4, population_size=50):
+    rng = np.random.default_rng(0)
+    elements = correlated_elements(np.arange(n_elements) * 0.1, rng, population_size, independent_noise=0.05)
+    search = Search(elements, keep_samples=True, population_size=population_size)
+    for _ in search.run(n_iter=10_000, alpha=0.05, n_leaders=n_elements, check_period=10):
+        pass
+    assert search.get_total_visits() < 10_000
+    assert search.get_best_index() == n_elements - 1
+
+    # exact once the whole population is sampled
+    for i in range(n_elements):
+        search.samples[i] = [elements[i]() for _ in range(population_size)]
+    assert search.get_paired_difference(0, 1)['std_err'] == 0.
+
+    with pytest.raises(ValueError):
+        next(Search(elements).run(n_iter=1, alpha=0.05))
+    with pytest.raises(ValueError):
+        next(Search(elements, keep_samples=True).run(n_iter=1, alpha=0.05, n_leaders=1))
+
+
+def test_wrong_stop_rate(n_runs=100, n_elements=4, alpha=0.05):
+    """With equal means, every early stop is a wrong stop"""
+    rng = np.random.default_rng(0)
+    n_stops = 0
+    for _ in range(n_runs):
+        search = Search(correlated_elements(np.zeros(n_elements), rng), keep_samples=True)
+        for _ in search.run(n_iter=1000, alpha=alpha, n_leaders=2, check_period=10):
+            pass
+        n_stops += search.get_total_visits() < 1000
+    assert n_stops <= alpha * n_runs
+
+
 if __name__ == '__main__':
     test_search()
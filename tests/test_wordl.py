@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from src.load_data import Alphabet, encode_words, load_data
+from src.color_rules import ColorRules
+from src.wordl import Wordl, SAMPLING_MODES, stratified_permutation
+
+
+def get_wordl(sampling='cycle', seed=0, n_wordles=None):
+    allowed_wordles, allowed_guesses, alphabet = load_data()
+    return Wordl(allowed_wordles[:n_wordles], allowed_guesses, sampling=sampling, seed=seed, alphabet=alphabet)
+
+
+@pytest.mark.parametrize('sampling', SAMPLING_MODES)
+def test_sample_order_is_permutation(sampling):
+    wordl = get_wordl(sampling)
+    order = wordl.get_sample_order()
+    assert np.array_equal(np.sort(order), np.arange(len(wordl.wordles)))
+    assert np.array_equal(order, get_wordl(sampling).get_sample_order())  # seeded
+
+
+def test_same_solution_for_every_guess(monkeypatch):
+    wordl = get_wordl('crn', n_wordles=50)
+    solutions = {}
+    guess = Wordl.guess
+
+    def record(self, word, solution):
+        solutions.setdefault(word, []).append(solution)
+        guess(self, word, solution)
+
+    monkeypatch.setattr(Wordl, 'guess', record)
+    for index, n_samples in [(0, 10), (7, 20), (123, 15)]:
+        for _ in range(n_samples):
+            wordl[index]()
+
+    expected = list(wordl.get_possible_solutions()[wordl.get_sample_order()[:20]])
+    for word_solutions in solutions.values():
+        assert word_solutions == expected[:len(word_solutions)]
+
+
+def test_estimate_is_exact_after_all_solutions():
+    n_wordles = 40
+    means = {}
+    for sampling in SAMPLING_MODES:
+        wordl = get_wordl(sampling, n_wordles=n_wordles)
+        means[sampling] = [np.mean([wordl[index]() for _ in range(n_wordles)]) for index in [0, 500, 3000]]
+    assert np.allclose(means['crn'], means['cycle'])
+    assert np.allclose(means['stratified'], means['cycle'])
+
+
+def test_stratified_prefixes():
+    wordles, _, _ = load_data()
+    strata = wordles[:, 0]
+    share = np.bincount(strata, minlength=256) / len(strata)
+    order = stratified_permutation(strata, np.random.default_rng(0))
+
+    counts = np.cumsum(np.eye(256)[strata[order]], axis=0)
+    expected = np.arange(1, len(order) + 1)[:, None] * share
+    assert np.max(np.abs(counts - expected)) < 2
+
+
+def test_sample_order_reset_after_update():
+    wordl = get_wordl('stratified')
+    order = wordl.get_sample_order()
+    wordl.guess('crate', 'scowl')
+    new_order = wordl.get_sample_order()
+    assert new_order is not order
+    assert np.array_equal(np.sort(new_order), np.arange(len(wordl.wordles)))
+
+
+def test_reset_call_counts():
+    wordl = get_wordl(n_wordles=20)
+    wordl[3]()
+    wordl.get_best_guess(n_iter=10, verbose=False)
+    assert wordl.call_counts.sum() == 10
+
+
+def test_wordl_word_length():
+    wordles = ['haus', 'baum', 'müll', 'maus', 'laus']
+    guesses = ['tanz']
+    alphabet = Alphabet()
+    encoded = encode_words(wordles, alphabet)
+
+    for wordl in [Wordl(wordles, guesses), Wordl(encoded, guesses, alphabet=alphabet)]:
+        assert wordl.word_length == 4
+        assert list(wordl.get_guesses()) == wordles + guesses
+
+        rules = ColorRules(word_length=4)
+        rules.add_rule(guess='LAUS', code='_AUS')
+        wordl.set_new_colors(rules.green, rules.yellow, rules.black)
+        wordl.update_wordles()
+        assert list(wordl.get_possible_solutions()) == ['haus', 'maus']
+
+        score = wordl[0]()
+        assert 0. <= score <= 1.
+        assert np.all(wordl.call_counts == np.eye(len(wordl))[0])
+
+
+def test_wordl_word_length_mismatch():
+    with pytest.raises(ValueError):
+        Wordl(['haus', 'baum'], ['crate'])
+    with pytest.raises(ValueError):
+        Wordl(['haus', 'baum'], ['tanz'], word_length=5)
+    with pytest.raises(ValueError):
+        Wordl(encode_words(['haus'], Alphabet()), ['tanz'])
+
+
+def test_wordl_inputs():
+    wordl = Wordl(np.array(['HAUS', 'baum']), [])
+    assert list(wordl.get_guesses()) == ['haus', 'baum']
+    wordl.set_new_colors(['h', '', '', ''], [set(), set(), set(), set()], set())
+    wordl.update_wordles()
+    assert list(wordl.get_possible_solutions()) == ['haus']